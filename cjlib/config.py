@@ -1,5 +1,6 @@
 """Configuration management for .cj directory and its contents."""
 
+import functools
 import shutil
 from pathlib import Path
 
@@ -82,6 +83,48 @@ class ImageNameNotFoundError(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=4)
+def _parse_apt_packages(dockerfile_content: str) -> frozenset[str]:
+    """Parse package names from apt-get install lines in Dockerfile content.
+
+    Parsing is pure, so results are cached by content. In practice this means
+    DOCKERFILE_TEMPLATE is parsed once per process.
+
+    Args:
+        dockerfile_content: Content of the Dockerfile
+
+    Returns:
+        Frozen set of package names found in apt-get install commands
+    """
+    packages = set()
+    lines = dockerfile_content.split("\n")
+    in_apt_install = False
+
+    for line in lines:
+        stripped = line.strip()
+
+        # Check if this line starts an apt-get install command
+        if "apt-get install" in stripped:
+            in_apt_install = True
+
+        if in_apt_install:
+            # Extract package names (skip flags like -y and line continuations)
+            parts = stripped.split()
+            for part in parts:
+                # Skip apt-get command itself, flags, and line continuations
+                if part not in ["RUN", "apt-get", "install", "-y", "&&", "\\"]:
+                    # Remove trailing backslash if present
+                    pkg = part.rstrip("\\").strip()
+                    if pkg:
+                        packages.add(pkg)
+
+            # Check if line ends (no continuation)
+            if not stripped.endswith("\\"):
+                in_apt_install = False
+
+    return frozenset(packages)
+
+
 class Config:
     """Configuration management for CJ project."""
 
@@ -215,7 +258,7 @@ class Config:
 
         return content.split()
 
-    def _extract_packages_from_dockerfile(self, dockerfile_content: str) -> set[str]:
+    def _extract_packages_from_dockerfile(self, dockerfile_content: str) -> frozenset[str]:
         """Extract package names from apt-get install lines in Dockerfile.
 
         Args:
@@ -224,33 +267,7 @@ class Config:
         Returns:
             Set of package names found in apt-get install commands
         """
-        packages = set()
-        lines = dockerfile_content.split("\n")
-        in_apt_install = False
-
-        for line in lines:
-            stripped = line.strip()
-
-            # Check if this line starts an apt-get install command
-            if "apt-get install" in stripped:
-                in_apt_install = True
-
-            if in_apt_install:
-                # Extract package names (skip flags like -y and line continuations)
-                parts = stripped.split()
-                for part in parts:
-                    # Skip apt-get command itself, flags, and line continuations
-                    if part not in ["RUN", "apt-get", "install", "-y", "&&", "\\"]:
-                        # Remove trailing backslash if present
-                        pkg = part.rstrip("\\").strip()
-                        if pkg:
-                            packages.add(pkg)
-
-                # Check if line ends (no continuation)
-                if not stripped.endswith("\\"):
-                    in_apt_install = False
-
-        return packages
+        return _parse_apt_packages(dockerfile_content)
 
     def _generate_dockerfile_with_packages(self, extra_packages: list[str]) -> str:
         """Generate Dockerfile content with extra packages added.
@@ -271,33 +288,27 @@ class Config:
             # No new packages to add, return template as-is
             return DOCKERFILE_TEMPLATE
 
-        # Add new packages to the apt-get install line
-        # Find the line with apt-get install and add packages there
+        # Add new packages to the first apt-get install block, just before the
+        # line that terminates it (the first line without a continuation)
         lines = DOCKERFILE_TEMPLATE.split("\n")
         result_lines = []
         in_apt_install = False
-        install_block_lines = []
+        packages_added = False
 
         for line in lines:
             stripped = line.strip()
 
-            if "apt-get install" in stripped:
+            if not packages_added and "apt-get install" in stripped:
                 in_apt_install = True
-                install_block_lines = [line]
-            elif in_apt_install:
-                install_block_lines.append(line)
-                if not stripped.endswith("\\"):
-                    # End of apt-get install block
-                    # Add new packages before the last line
-                    for pkg in new_packages:
-                        # Add each package with proper indentation and continuation
-                        result_lines.append(f"    {pkg} \\")
-                    # Append the collected install block lines
-                    result_lines.extend(install_block_lines)
-                    in_apt_install = False
-                    install_block_lines = []
-            else:
-                result_lines.append(line)
+            elif in_apt_install and not stripped.endswith("\\"):
+                # End of apt-get install block
+                for pkg in new_packages:
+                    # Add each package with proper indentation and continuation
+                    result_lines.append(f"    {pkg} \\")
+                in_apt_install = False
+                packages_added = True
+
+            result_lines.append(line)
 
         return "\n".join(result_lines)
 
@@ -1,7 +1,10 @@
 """Container operations wrapper for macOS container command."""
 
+import os
+import signal
 import subprocess
 import shutil
+from itertools import chain
 from typing import List
 
 
@@ -25,31 +28,66 @@ class ContainerRunError(Exception):
 
 
 def _run_command(
-    args: List[str], check: bool = True, capture_output: bool = True
+    args: List[str], check: bool = True, capture_output: bool = True, decode: bool = True
 ) -> subprocess.CompletedProcess:
-    """Execute a command using subprocess.run().
+    """Execute a command and wait for it to finish.
+
+    Captured commands go through subprocess.run(). When output is not captured the
+    command is started directly with os.posix_spawnp(), skipping the pipe setup done by
+    subprocess; like subprocess, the child gets default SIGPIPE/SIGXFSZ handling and is
+    killed and reaped if waiting for it is interrupted.
 
     Args:
         args: Command and arguments as a list
         check: If True, raise CalledProcessError on non-zero exit
         capture_output: If True, capture stdout and stderr
+        decode: If True, decode captured output to str; if False, keep it as raw bytes
 
     Returns:
         CompletedProcess object containing the result
     """
-    return subprocess.run(args, check=check, capture_output=capture_output, text=True)
+    if not capture_output:
+        pid = os.posix_spawnp(args[0], args, os.environ, setsigdef=(signal.SIGPIPE, signal.SIGXFSZ))
+        try:
+            _, status = os.waitpid(pid, 0)
+        except BaseException:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            os.waitpid(pid, 0)
+            raise
+        result = subprocess.CompletedProcess(args, os.waitstatus_to_exitcode(status))
+        if check:
+            result.check_returncode()
+        return result
+
+    return subprocess.run(args, check=check, capture_output=capture_output, text=decode)
+
+
+# Sentinel for lookups that have not been performed yet
+_UNSET = object()
 
 
 class ContainerManager:
     """Manager for macOS container command operations."""
 
+    def __init__(self):
+        """Initialize ContainerManager."""
+        self._container_path = _UNSET
+        self._image_cache = {}
+
     def check_container_available(self) -> bool:
         """Check if the container command is available.
 
+        The PATH lookup is performed once and cached for the lifetime of the instance.
+
         Returns:
             bool: True if container command exists, False otherwise
         """
-        return shutil.which("container") is not None
+        if self._container_path is _UNSET:
+            self._container_path = shutil.which("container")
+        return self._container_path is not None
 
     def build_image(
         self, dockerfile_path: str, tag: str, context_dir: str, log_file: str = None
@@ -65,12 +103,17 @@ class ContainerManager:
         Raises:
             ContainerBuildError: If the build fails
         """
+        # The tag is about to be (re)built, so any cached lookup is stale
+        self._image_cache.pop(tag, None)
+
+        # Keep build output as raw bytes; it is written to the log file unchanged
         try:
             result = _run_command(
-                ["container", "build", "-t", tag, "-f", dockerfile_path, context_dir]
+                ["container", "build", "-t", tag, "-f", dockerfile_path, context_dir],
+                decode=False,
             )
             if log_file:
-                with open(log_file, "w") as f:
+                with open(log_file, "wb") as f:
                     if result.stdout:
                         f.write(result.stdout)
                     if result.stderr:
@@ -78,11 +121,11 @@ class ContainerManager:
         except subprocess.CalledProcessError as e:
             error_msg = "Failed to build image"
             if e.stderr:
-                error_msg += f"\nError output:\n{e.stderr}"
+                error_msg += f"\nError output:\n{e.stderr.decode(errors='replace')}"
             if e.stdout:
-                error_msg += f"\nOutput:\n{e.stdout}"
+                error_msg += f"\nOutput:\n{e.stdout.decode(errors='replace')}"
             if log_file:
-                with open(log_file, "w") as f:
+                with open(log_file, "wb") as f:
                     if e.stdout:
                         f.write(e.stdout)
                     if e.stderr:
@@ -92,18 +135,26 @@ class ContainerManager:
     def image_exists(self, tag: str) -> bool:
         """Check if a container image exists.
 
+        Results are cached per tag for the lifetime of the instance. Building or
+        removing an image through this manager invalidates its cached result.
+
         Args:
             tag: Tag name to check for
 
         Returns:
             bool: True if image exists, False otherwise
         """
+        if tag in self._image_cache:
+            return self._image_cache[tag]
+
         try:
-            result = _run_command(["container", "image", "list"], check=False)
-            return tag in result.stdout
+            result = _run_command(["container", "image", "inspect", tag], check=False, decode=False)
         except Exception:
             return False
 
+        self._image_cache[tag] = result.returncode == 0
+        return self._image_cache[tag]
+
     def run_interactive(
         self,
         image: str,
@@ -129,31 +180,21 @@ class ContainerManager:
         Raises:
             ContainerRunError: If the container fails to run
         """
-        # Build the command
-        cmd = ["container", "run", "-it", "--rm"]
-
-        # Add port forwards
-        if port_forwards:
-            for host_port, container_port in port_forwards:
-                cmd.extend(["-p", f"{host_port}:{container_port}"])
-
-        # Add environment variables
-        if env_vars:
-            for env_var in env_vars:
-                cmd.extend(["-e", env_var])
-
-        # Add volume mounts
-        for mount in volume_mounts:
-            cmd.extend(["-v", mount])
-
-        # Add working directory
-        cmd.extend(["-w", working_dir])
-
-        # Add image
-        cmd.append(image)
-
-        # Add command to execute
-        cmd.extend(command)
+        # Build the command in a single pass: port forwards, environment variables,
+        # volume mounts, working directory, image, then the command to execute
+        cmd = list(
+            chain(
+                ["container", "run", "-it", "--rm"],
+                chain.from_iterable(
+                    ("-p", f"{host_port}:{container_port}")
+                    for host_port, container_port in port_forwards or []
+                ),
+                chain.from_iterable(("-e", env_var) for env_var in env_vars or []),
+                chain.from_iterable(("-v", mount) for mount in volume_mounts),
+                ["-w", working_dir, image],
+                command,
+            )
+        )
 
         try:
             result = _run_command(cmd, check=False, capture_output=False)
@@ -170,8 +211,9 @@ class ContainerManager:
         Note:
             Does not raise an error if the image doesn't exist
         """
+        self._image_cache.pop(tag, None)
         try:
-            _run_command(["container", "image", "delete", tag], check=False)
+            _run_command(["container", "image", "delete", tag], check=False, decode=False)
         except Exception:
             # Ignore errors (e.g., image doesn't exist)
             pass
@@ -50,21 +50,47 @@ NOUNS = [
     "fox",
 ]
 
-# Pattern for valid names
+# Set views of the word lists for constant-time membership checks
+ADJECTIVE_SET = frozenset(ADJECTIVES)
+NOUN_SET = frozenset(NOUNS)
+
+# Pattern for valid names, compiled once at import
 NAME_PATTERN = re.compile(r"^cj-[a-z]+-[a-z]+$")
 
 
-def generate_name() -> str:
+def generate_name(rng: random.Random = None) -> str:
     """Generate a random name in the format cj-{adjective}-{noun}.
 
+    Args:
+        rng: Optional random number generator; defaults to the global random module
+
     Returns:
         str: A randomly generated name like "cj-happy-turtle"
     """
-    adjective = random.choice(ADJECTIVES)
-    noun = random.choice(NOUNS)
+    if rng is None:
+        rng = random
+    adjective = rng.choice(ADJECTIVES)
+    noun = rng.choice(NOUNS)
     return f"cj-{adjective}-{noun}"
 
 
+def generate_names(n: int, rng: random.Random = None) -> list[str]:
+    """Generate n random names in the format cj-{adjective}-{noun}.
+
+    Args:
+        n: Number of names to generate
+        rng: Optional random number generator; defaults to the global random module
+
+    Returns:
+        list[str]: n randomly generated names (not necessarily distinct)
+    """
+    if rng is None:
+        rng = random
+    adjectives = rng.choices(ADJECTIVES, k=n)
+    nouns = rng.choices(NOUNS, k=n)
+    return [f"cj-{adjective}-{noun}" for adjective, noun in zip(adjectives, nouns)]
+
+
 def is_valid_name(name: str) -> bool:
     """Check if a name matches the valid pattern cj-[a-z]+-[a-z]+.
 
@@ -74,4 +100,7 @@ def is_valid_name(name: str) -> bool:
     Returns:
         bool: True if the name is valid, False otherwise
     """
-    return NAME_PATTERN.match(name) is not None
+    # Cheap string checks reject most invalid names before running the regex
+    if not name.startswith("cj-") or name.count("-") != 2:
+        return False
+    return NAME_PATTERN.fullmatch(name) is not None
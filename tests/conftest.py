@@ -1,5 +1,6 @@
 """Shared fixtures for test suite."""
 
+import types
 import pytest
 from unittest.mock import Mock
 from cjlib.config import Config
@@ -7,10 +8,39 @@ from cjlib.container import ContainerManager
 from cjlib.setup import SetupCommand
 
 
+# Attribute names of the mocked classes, introspected once instead of per Mock(spec=...)
+CONFIG_SPEC = dir(Config)
+CONTAINER_MANAGER_SPEC = dir(ContainerManager)
+
+
+@pytest.fixture(autouse=True)
+def _no_config_disk_writes(request, monkeypatch):
+    """Fixture turning Config's directory and Dockerfile writers into no-ops.
+
+    Tests that check what these methods put on disk opt out with @pytest.mark.real_fs.
+    """
+    if request.node.get_closest_marker("real_fs"):
+        return
+    monkeypatch.setattr(Config, "ensure_claude_dir", lambda self: None)
+    monkeypatch.setattr(
+        Config, "generate_and_write_dockerfile", lambda self, extra_packages=None: None
+    )
+
+
+@pytest.fixture
+def cj(tmp_path):
+    """Fixture providing a real Config with an existing .cj directory under tmp_path."""
+    config_dir = tmp_path / ".cj"
+    config_dir.mkdir()
+    return types.SimpleNamespace(
+        config=Config(str(tmp_path)), dir=config_dir, dockerfile=config_dir / "Dockerfile"
+    )
+
+
 @pytest.fixture
 def mock_config(tmp_path):
     """Fixture providing a mocked Config instance with common setup."""
-    config = Mock(spec=Config)
+    config = Mock(spec=CONFIG_SPEC)
     config_dir = tmp_path / ".cj"
     config.get_config_dir.return_value = str(config_dir)
     config.get_dockerfile_path.return_value = str(config_dir / "Dockerfile")
@@ -23,7 +53,7 @@ def mock_config(tmp_path):
 @pytest.fixture
 def mock_container_manager():
     """Fixture providing a mocked ContainerManager instance."""
-    return Mock(spec=ContainerManager)
+    return Mock(spec=CONTAINER_MANAGER_SPEC)
 
 
 @pytest.fixture
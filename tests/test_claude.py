@@ -229,7 +229,7 @@ def test_run_container_exit_code_propagated():
     assert result == 42
 
 
-def test_run_interactive_called_with_correct_params():
+def test_run_interactive_called_with_correct_params(monkeypatch):
     """Test run_interactive is called with correct parameters."""
     config = Mock(spec=Config)
     config.exists.return_value = True
@@ -245,10 +245,8 @@ def test_run_interactive_called_with_correct_params():
 
     claude_cmd = ClaudeCommand(config, container_mgr, setup_cmd)
 
-    with (
-        patch("os.getcwd", return_value="/test"),
-        patch.dict("os.environ", {"TERM": "xterm-256color"}),
-    ):
+    monkeypatch.setenv("TERM", "xterm-256color")
+    with patch("os.getcwd", return_value="/test"):
         result = claude_cmd.run()
 
     # Verify run_interactive called with correct params
@@ -309,7 +307,7 @@ def test_run_general_exception_handling():
     container_mgr.run_interactive.assert_not_called()
 
 
-def test_run_passes_term_from_environment():
+def test_run_passes_term_from_environment(monkeypatch):
     """Test that TERM environment variable is passed to container."""
     config = Mock(spec=Config)
     config.exists.return_value = True
@@ -324,20 +322,18 @@ def test_run_passes_term_from_environment():
 
     claude_cmd = ClaudeCommand(config, container_mgr, setup_cmd)
 
-    with (
-        patch("os.getcwd", return_value="/test"),
-        patch.dict("os.environ", {"TERM": "screen-256color"}),
-    ):
+    monkeypatch.setenv("TERM", "screen-256color")
+    with patch("os.getcwd", return_value="/test"):
         result = claude_cmd.run()
 
     # Verify TERM was passed from environment
     assert result == 0
-    call_kwargs = container_mgr.run_interactive.call_args[1]
+    call_kwargs = container_mgr.run_interactive.call_args.kwargs
     assert "env_vars" in call_kwargs
     assert "TERM=screen-256color" in call_kwargs["env_vars"]
 
 
-def test_run_defaults_term_when_not_set():
+def test_run_defaults_term_when_not_set(monkeypatch):
     """Test that TERM defaults to xterm-256color when not set in environment."""
     config = Mock(spec=Config)
     config.exists.return_value = True
@@ -352,14 +348,12 @@ def test_run_defaults_term_when_not_set():
 
     claude_cmd = ClaudeCommand(config, container_mgr, setup_cmd)
 
-    with (
-        patch("os.getcwd", return_value="/test"),
-        patch.dict("os.environ", {}, clear=True),  # Clear TERM from environment
-    ):
+    monkeypatch.delenv("TERM", raising=False)
+    with patch("os.getcwd", return_value="/test"):
         result = claude_cmd.run()
 
     # Verify TERM defaults to xterm-256color
     assert result == 0
-    call_kwargs = container_mgr.run_interactive.call_args[1]
+    call_kwargs = container_mgr.run_interactive.call_args.kwargs
     assert "env_vars" in call_kwargs
     assert "TERM=xterm-256color" in call_kwargs["env_vars"]
@@ -1,5 +1,6 @@
 """Tests for CLI argument parsing and command routing."""
 
+import contextlib
 import pytest
 from unittest.mock import Mock, patch
 from cjlib.cli import main
@@ -7,59 +8,37 @@ from cjlib.config import ConfigExistsError, ConfigNotFoundError, ImageNameNotFou
 from cjlib.container import ContainerNotAvailableError, ContainerBuildError, ContainerRunError
 
 
-@pytest.fixture
-def mock_config():
-    """Fixture for mocked Config class."""
-    with patch("cjlib.cli.Config") as mock:
-        yield mock
-
-
-@pytest.fixture
-def mock_container_manager():
-    """Fixture for mocked ContainerManager class."""
-    with patch("cjlib.cli.ContainerManager") as mock:
-        yield mock
-
-
-@pytest.fixture
-def mock_setup_command():
-    """Fixture for mocked SetupCommand class."""
-    with patch("cjlib.cli.SetupCommand") as mock:
-        yield mock
-
-
-@pytest.fixture
-def mock_update_command():
-    """Fixture for mocked UpdateCommand class."""
-    with patch("cjlib.cli.UpdateCommand") as mock:
-        yield mock
-
-
-@pytest.fixture
-def mock_claude_command():
-    """Fixture for mocked ClaudeCommand class."""
-    with patch("cjlib.cli.ClaudeCommand") as mock:
-        yield mock
+# Classes patched in cjlib.cli, keyed by the name tests use to look them up
+CLI_PATCH_TARGETS = {
+    "mock_config": "cjlib.cli.Config",
+    "mock_container_manager": "cjlib.cli.ContainerManager",
+    "mock_setup_command": "cjlib.cli.SetupCommand",
+    "mock_update_command": "cjlib.cli.UpdateCommand",
+    "mock_claude_command": "cjlib.cli.ClaudeCommand",
+    "mock_shell_command": "cjlib.cli.ShellCommand",
+}
 
 
 @pytest.fixture
-def mock_shell_command():
-    """Fixture for mocked ShellCommand class."""
-    with patch("cjlib.cli.ShellCommand") as mock:
-        yield mock
+def cli_mocks():
+    """Fixture patching all classes used by cli.main, returned as a dict of mocks."""
+    with contextlib.ExitStack() as stack:
+        yield {
+            name: stack.enter_context(patch(target)) for name, target in CLI_PATCH_TARGETS.items()
+        }
 
 
 @pytest.mark.parametrize(
-    "argv,command_fixture",
+    "argv,command_key",
     [
         (["cj", "setup"], "mock_setup_command"),
         (["cj", "update"], "mock_update_command"),
         (["cj", "shell"], "mock_shell_command"),
     ],
 )
-def test_command_routing(argv, command_fixture, request, mock_config, mock_container_manager):
+def test_command_routing(argv, command_key, cli_mocks):
     """Test that setup, update, and shell subcommands route to correct handlers."""
-    mock_cmd_class = request.getfixturevalue(command_fixture)
+    mock_cmd_class = cli_mocks[command_key]
     mock_cmd = Mock()
     mock_cmd.run.return_value = 0
     mock_cmd_class.return_value = mock_cmd
@@ -72,35 +51,31 @@ def test_command_routing(argv, command_fixture, request, mock_config, mock_conta
     mock_cmd.run.assert_called_once()
 
 
-def test_default_command_routing(
-    mock_config, mock_container_manager, mock_setup_command, mock_claude_command
-):
+def test_default_command_routing(cli_mocks):
     """Test that no subcommand routes to ClaudeCommand."""
     mock_claude = Mock()
     mock_claude.run.return_value = 0
-    mock_claude_command.return_value = mock_claude
+    cli_mocks["mock_claude_command"].return_value = mock_claude
 
     with patch("sys.argv", ["cj"]):
         result = main()
 
     assert result == 0
-    mock_claude_command.assert_called_once()
+    cli_mocks["mock_claude_command"].assert_called_once()
     mock_claude.run.assert_called_once()
 
 
 @pytest.mark.parametrize(
-    "argv,command_fixture,exit_code",
+    "argv,command_key,exit_code",
     [
         (["cj", "setup"], "mock_setup_command", 42),
         (["cj", "update"], "mock_update_command", 1),
         (["cj", "shell"], "mock_shell_command", 3),
     ],
 )
-def test_exit_code_propagation(
-    argv, command_fixture, exit_code, request, mock_config, mock_container_manager
-):
+def test_exit_code_propagation(argv, command_key, exit_code, cli_mocks):
     """Test that exit codes are propagated from commands."""
-    mock_cmd_class = request.getfixturevalue(command_fixture)
+    mock_cmd_class = cli_mocks[command_key]
     mock_cmd = Mock()
     mock_cmd.run.return_value = exit_code
     mock_cmd_class.return_value = mock_cmd
@@ -111,13 +86,11 @@ def test_exit_code_propagation(
     assert result == exit_code
 
 
-def test_exit_code_propagation_claude(
-    mock_config, mock_container_manager, mock_setup_command, mock_claude_command
-):
+def test_exit_code_propagation_claude(cli_mocks):
     """Test that exit codes are propagated from ClaudeCommand."""
     mock_claude = Mock()
     mock_claude.run.return_value = 5
-    mock_claude_command.return_value = mock_claude
+    cli_mocks["mock_claude_command"].return_value = mock_claude
 
     with patch("sys.argv", ["cj"]):
         result = main()
@@ -126,7 +99,7 @@ def test_exit_code_propagation_claude(
 
 
 @pytest.mark.parametrize(
-    "argv,command_fixture,exception",
+    "argv,command_key,exception",
     [
         (["cj", "setup"], "mock_setup_command", ConfigExistsError("Config exists")),
         (["cj", "update"], "mock_update_command", ConfigNotFoundError("Config not found")),
@@ -145,11 +118,9 @@ def test_exit_code_propagation_claude(
         (["cj", "shell"], "mock_shell_command", ConfigNotFoundError("Config not found")),
     ],
 )
-def test_error_handling(
-    argv, command_fixture, exception, request, mock_config, mock_container_manager
-):
+def test_error_handling(argv, command_key, exception, cli_mocks):
     """Test handling of various exceptions."""
-    mock_cmd_class = request.getfixturevalue(command_fixture)
+    mock_cmd_class = cli_mocks[command_key]
     mock_cmd = Mock()
     mock_cmd.run.side_effect = exception
     mock_cmd_class.return_value = mock_cmd
@@ -160,13 +131,11 @@ def test_error_handling(
     assert result == 1
 
 
-def test_container_run_error_handling(
-    mock_config, mock_container_manager, mock_setup_command, mock_claude_command
-):
+def test_container_run_error_handling(cli_mocks):
     """Test handling of ContainerRunError."""
     mock_claude = Mock()
     mock_claude.run.side_effect = ContainerRunError("Run failed")
-    mock_claude_command.return_value = mock_claude
+    cli_mocks["mock_claude_command"].return_value = mock_claude
 
     with patch("sys.argv", ["cj"]):
         result = main()
@@ -174,42 +143,40 @@ def test_container_run_error_handling(
     assert result == 1
 
 
-def test_config_and_container_manager_instantiation(mock_setup_command):
+def test_config_and_container_manager_instantiation(cli_mocks):
     """Test that Config and ContainerManager are instantiated correctly."""
-    with patch("cjlib.cli.Config") as mock_config_class:
-        with patch("cjlib.cli.ContainerManager") as mock_container_class:
-            mock_setup = Mock()
-            mock_setup.run.return_value = 0
-            mock_setup_command.return_value = mock_setup
+    mock_setup_command = cli_mocks["mock_setup_command"]
+    mock_setup = Mock()
+    mock_setup.run.return_value = 0
+    mock_setup_command.return_value = mock_setup
 
-            with patch("sys.argv", ["cj", "setup"]):
-                main()
+    with patch("sys.argv", ["cj", "setup"]):
+        main()
 
-            # Verify Config and ContainerManager were instantiated
-            mock_config_class.assert_called_once()
-            mock_container_class.assert_called_once()
+    # Verify Config and ContainerManager were instantiated
+    mock_config_class = cli_mocks["mock_config"]
+    mock_container_class = cli_mocks["mock_container_manager"]
+    mock_config_class.assert_called_once()
+    mock_container_class.assert_called_once()
 
-            # Verify they were passed to SetupCommand
-            config_instance = mock_config_class.return_value
-            container_instance = mock_container_class.return_value
-            mock_setup_command.assert_called_once_with(config_instance, container_instance)
+    # Verify they were passed to SetupCommand
+    config_instance = mock_config_class.return_value
+    container_instance = mock_container_class.return_value
+    mock_setup_command.assert_called_once_with(config_instance, container_instance)
 
 
-def test_claude_mode_gets_setup_command(mock_setup_command, mock_claude_command):
+def test_claude_mode_gets_setup_command(cli_mocks):
     """Test that ClaudeCommand receives SetupCommand instance."""
-    with patch("cjlib.cli.Config") as mock_config_class:
-        with patch("cjlib.cli.ContainerManager") as mock_container_class:
-            mock_claude = Mock()
-            mock_claude.run.return_value = 0
-            mock_claude_command.return_value = mock_claude
-
-            with patch("sys.argv", ["cj"]):
-                main()
-
-            # Verify ClaudeCommand received Config, ContainerManager, and SetupCommand
-            config_instance = mock_config_class.return_value
-            container_instance = mock_container_class.return_value
-            setup_instance = mock_setup_command.return_value
-            mock_claude_command.assert_called_once_with(
-                config_instance, container_instance, setup_instance
-            )
+    mock_claude_command = cli_mocks["mock_claude_command"]
+    mock_claude = Mock()
+    mock_claude.run.return_value = 0
+    mock_claude_command.return_value = mock_claude
+
+    with patch("sys.argv", ["cj"]):
+        main()
+
+    # Verify ClaudeCommand received Config, ContainerManager, and SetupCommand
+    config_instance = cli_mocks["mock_config"].return_value
+    container_instance = cli_mocks["mock_container_manager"].return_value
+    setup_instance = cli_mocks["mock_setup_command"].return_value
+    mock_claude_command.assert_called_once_with(config_instance, container_instance, setup_instance)
@@ -14,6 +14,20 @@ from cjlib.config import (
 )
 
 
+@pytest.fixture(scope="module")
+def path_config(tmp_path_factory):
+    """Fixture providing one Config per module for tests that only read its paths."""
+    base_dir = tmp_path_factory.mktemp("cfg")
+    return Config(str(base_dir)), base_dir
+
+
+@pytest.fixture
+def config_with_dir(tmp_path):
+    """Fixture providing a Config whose .cj directory already exists."""
+    (tmp_path / CONFIG_DIR).mkdir()
+    return Config(str(tmp_path))
+
+
 class TestConfig:
     """Tests for Config class."""
 
@@ -22,15 +36,15 @@ class TestConfig:
         config = Config()
         assert config.base_dir == Path(".").resolve()
 
-    def test_init_with_custom_directory(self, tmp_path):
+    def test_init_with_custom_directory(self, path_config):
         """Test Config initialization with custom directory."""
-        config = Config(str(tmp_path))
-        assert config.base_dir == tmp_path
+        config, base_dir = path_config
+        assert config.base_dir == base_dir
 
-    def test_get_config_dir(self, tmp_path):
+    def test_get_config_dir(self, path_config):
         """Test get_config_dir returns correct path."""
-        config = Config(str(tmp_path))
-        expected = str(tmp_path / CONFIG_DIR)
+        config, base_dir = path_config
+        expected = str(base_dir / CONFIG_DIR)
         assert config.get_config_dir() == expected
 
     def test_exists_returns_false_when_no_config(self, tmp_path):
@@ -58,56 +72,54 @@ class TestConfig:
             config.create_config_dir()
         assert "already exists" in str(exc_info.value)
 
-    def test_get_image_name_path(self, tmp_path):
+    def test_get_image_name_path(self, path_config):
         """Test get_image_name_path() returns correct path."""
-        config = Config(str(tmp_path))
-        expected = str(tmp_path / CONFIG_DIR / IMAGE_NAME_FILE)
+        config, base_dir = path_config
+        expected = str(base_dir / CONFIG_DIR / IMAGE_NAME_FILE)
         assert config.get_image_name_path() == expected
 
-    def test_write_and_read_image_name(self, tmp_path):
+    def test_write_and_read_image_name(self, config_with_dir):
         """Test write_image_name() and read_image_name() work together."""
-        config = Config(str(tmp_path))
-        (tmp_path / CONFIG_DIR).mkdir()
+        config = config_with_dir
 
         test_name = "cj-happy-turtle"
         config.write_image_name(test_name)
 
         assert config.read_image_name() == test_name
 
-    def test_read_image_name_raises_error_when_not_found(self, tmp_path):
+    def test_read_image_name_raises_error_when_not_found(self, config_with_dir):
         """Test read_image_name() raises ImageNameNotFoundError when file doesn't exist."""
-        config = Config(str(tmp_path))
-        (tmp_path / CONFIG_DIR).mkdir()
+        config = config_with_dir
 
         with pytest.raises(ImageNameNotFoundError) as exc_info:
             config.read_image_name()
         assert "not found" in str(exc_info.value)
 
-    def test_get_dockerfile_path(self, tmp_path):
+    def test_get_dockerfile_path(self, path_config):
         """Test get_dockerfile_path() returns correct path."""
-        config = Config(str(tmp_path))
-        expected = str(tmp_path / CONFIG_DIR / DOCKERFILE_NAME)
+        config, base_dir = path_config
+        expected = str(base_dir / CONFIG_DIR / DOCKERFILE_NAME)
         assert config.get_dockerfile_path() == expected
 
-    def test_get_claude_dir(self, tmp_path):
+    def test_get_claude_dir(self, path_config):
         """Test get_claude_dir() returns correct path."""
-        config = Config(str(tmp_path))
-        expected = str(tmp_path / CONFIG_DIR / CLAUDE_DIR)
+        config, base_dir = path_config
+        expected = str(base_dir / CONFIG_DIR / CLAUDE_DIR)
         assert config.get_claude_dir() == expected
 
-    def test_ensure_claude_dir_creates_directory(self, tmp_path):
+    @pytest.mark.real_fs
+    def test_ensure_claude_dir_creates_directory(self, tmp_path, config_with_dir):
         """Test ensure_claude_dir() creates directory if it doesn't exist."""
-        config = Config(str(tmp_path))
-        (tmp_path / CONFIG_DIR).mkdir()
+        config = config_with_dir
 
         config.ensure_claude_dir()
 
         assert (tmp_path / CONFIG_DIR / CLAUDE_DIR).is_dir()
 
-    def test_ensure_claude_dir_is_idempotent(self, tmp_path):
+    @pytest.mark.real_fs
+    def test_ensure_claude_dir_is_idempotent(self, tmp_path, config_with_dir):
         """Test ensure_claude_dir() doesn't error if directory already exists."""
-        config = Config(str(tmp_path))
-        (tmp_path / CONFIG_DIR).mkdir()
+        config = config_with_dir
         (tmp_path / CONFIG_DIR / CLAUDE_DIR).mkdir()
 
         # Should not raise error
@@ -115,10 +127,10 @@ class TestConfig:
 
         assert (tmp_path / CONFIG_DIR / CLAUDE_DIR).is_dir()
 
-    def test_get_venv_dir(self, tmp_path):
+    def test_get_venv_dir(self, path_config):
         """Test get_venv_dir() returns correct path."""
-        config = Config(str(tmp_path))
-        expected = str(tmp_path / CONFIG_DIR / VENV_DIR)
+        config, base_dir = path_config
+        expected = str(base_dir / CONFIG_DIR / VENV_DIR)
         assert config.get_venv_dir() == expected
 
     def test_cleanup_removes_entire_config_directory(self, tmp_path):
@@ -145,10 +157,9 @@ class TestConfig:
 
         assert not (tmp_path / CONFIG_DIR).exists()
 
-    def test_write_image_name_strips_whitespace(self, tmp_path):
+    def test_write_image_name_strips_whitespace(self, config_with_dir):
         """Test that image name is stored exactly as written."""
-        config = Config(str(tmp_path))
-        (tmp_path / CONFIG_DIR).mkdir()
+        config = config_with_dir
 
         test_name = "cj-test-name"
         config.write_image_name(test_name)
@@ -156,10 +167,9 @@ class TestConfig:
         # Read should strip whitespace
         assert config.read_image_name() == test_name
 
-    def test_read_image_name_strips_whitespace(self, tmp_path):
+    def test_read_image_name_strips_whitespace(self, tmp_path, config_with_dir):
         """Test that read_image_name() strips whitespace."""
-        config = Config(str(tmp_path))
-        (tmp_path / CONFIG_DIR).mkdir()
+        config = config_with_dir
 
         # Write with extra whitespace
         (tmp_path / CONFIG_DIR / IMAGE_NAME_FILE).write_text("  cj-test-name\n  ")
@@ -1,6 +1,9 @@
 """Tests for the container module."""
 
+import re
+import signal
 import subprocess
+from collections import namedtuple
 from unittest.mock import Mock, patch
 import pytest
 from cjlib.container import (
@@ -11,82 +14,167 @@ from cjlib.container import (
 )
 
 
-class TestRunCommand:
-    """Tests for _run_command helper function."""
+# Lightweight stand-in for the CompletedProcess returned by _run_command
+_Result = namedtuple("_Result", "returncode stdout stderr", defaults=(b"", b""))
+
+# Error message patterns, compiled once for pytest.raises(match=...)
+_BUILD_ERR_RE = re.compile("Failed to build image")
+_RUN_ERR_RE = re.compile("Failed to run container")
+
+# Expected `container run` argv for the run_interactive tests
+_RUN_PREFIX = ("container", "run", "-it", "--rm")
+_RUN_SUFFIX = ("-v", "host:container", "-w", "/workspace", "my-image", "bash")
+_EXPECTED_RUN_MOUNTS = _RUN_PREFIX + (
+    "-v",
+    "/host/path:/container/path",
+    "-v",
+    "/host/data:/data",
+    "-w",
+    "/workspace",
+    "my-image:latest",
+    "bash",
+    "-c",
+    "echo hello",
+)
+_EXPECTED_RUN_NO_MOUNTS = _RUN_PREFIX + ("-w", "/workspace", "my-image", "ls")
+_EXPECTED_RUN_FULL = _RUN_PREFIX + ("-p", "2222:22", "-e", "TERM=xterm-256color") + _RUN_SUFFIX
 
-    @patch("subprocess.run")
-    def test_run_command_with_defaults(self, mock_run):
-        """Test _run_command with default parameters."""
-        mock_result = Mock(returncode=0, stdout="output", stderr="")
-        mock_run.return_value = mock_result
 
-        result = _run_command(["echo", "hello"])
+class TestRunCommand:
+    """Tests for _run_command helper function."""
 
-        mock_run.assert_called_once_with(
-            ["echo", "hello"], check=True, capture_output=True, text=True
-        )
-        assert result == mock_result
+    @pytest.fixture(autouse=True)
+    def mock_run(self):
+        """Fixture patching subprocess.run once for every test in the class."""
+        with patch("subprocess.run", autospec=True) as mock:
+            yield mock
 
-    @patch("subprocess.run")
-    def test_run_command_without_check(self, mock_run):
-        """Test _run_command with check=False."""
-        mock_result = Mock(returncode=1)
+    @pytest.mark.parametrize(
+        "kwargs,expected_call_kwargs",
+        [
+            ({}, {"check": True, "capture_output": True, "text": True}),
+            ({"check": False}, {"check": False, "capture_output": True, "text": True}),
+            ({"decode": False}, {"check": True, "capture_output": True, "text": False}),
+        ],
+        ids=["defaults", "without_check", "without_decode"],
+    )
+    def test_run_command(self, kwargs, expected_call_kwargs, mock_run):
+        """Test that _run_command forwards its options to subprocess.run."""
+        mock_result = _Result(0, "output", "")
         mock_run.return_value = mock_result
 
-        result = _run_command(["false"], check=False)
+        result = _run_command(["echo", "hello"], **kwargs)
 
-        mock_run.assert_called_once_with(["false"], check=False, capture_output=True, text=True)
+        mock_run.assert_called_once_with(["echo", "hello"], **expected_call_kwargs)
         assert result == mock_result
 
-    @patch("subprocess.run")
-    def test_run_command_without_capture(self, mock_run):
-        """Test _run_command with capture_output=False."""
-        mock_result = Mock(returncode=0)
-        mock_run.return_value = mock_result
-
-        result = _run_command(["echo", "hello"], capture_output=False)
-
-        mock_run.assert_called_once_with(
-            ["echo", "hello"], check=True, capture_output=False, text=True
-        )
-        assert result == mock_result
+    @patch("os.waitpid", return_value=(1234, 3 << 8))
+    @patch("os.posix_spawnp", return_value=1234)
+    def test_run_command_without_capture_spawns_directly(self, mock_spawn, mock_wait, mock_run):
+        """Test that uncaptured commands bypass subprocess.run and report the exit code."""
+        result = _run_command(["container", "run"], check=False, capture_output=False)
+
+        mock_run.assert_not_called()
+        mock_spawn.assert_called_once()
+        assert mock_spawn.call_args.args[:2] == ("container", ["container", "run"])
+        assert mock_spawn.call_args.kwargs["setsigdef"] == (signal.SIGPIPE, signal.SIGXFSZ)
+        mock_wait.assert_called_once_with(1234, 0)
+        assert result.args == ["container", "run"]
+        assert result.returncode == 3
+
+    @patch("os.waitpid", return_value=(1234, 1 << 8))
+    @patch("os.posix_spawnp", return_value=1234)
+    def test_run_command_without_capture_honours_check(self, mock_spawn, mock_wait):
+        """Test that a failing uncaptured command raises when check is True."""
+        with pytest.raises(subprocess.CalledProcessError):
+            _run_command(["false"], capture_output=False)
+
+    @patch("os.kill")
+    @patch("os.waitpid", side_effect=[KeyboardInterrupt, (1234, 0)])
+    @patch("os.posix_spawnp", return_value=1234)
+    def test_run_command_without_capture_kills_child_on_interrupt(
+        self, mock_spawn, mock_wait, mock_kill
+    ):
+        """Test that an interrupted wait kills and reaps the spawned child before re-raising."""
+        with pytest.raises(KeyboardInterrupt):
+            _run_command(["container", "run"], capture_output=False)
+
+        mock_kill.assert_called_once_with(1234, signal.SIGKILL)
+        assert mock_wait.call_count == 2
+
+
+@pytest.fixture(scope="session")
+def container_shim_dir(tmp_path_factory):
+    """Fixture providing a directory with a no-op `container` executable, built once."""
+    bin_dir = tmp_path_factory.mktemp("bin")
+    shim = bin_dir / "container"
+    shim.write_text("#!/bin/sh\nexit 0\n")
+    shim.chmod(0o755)
+    return bin_dir
+
+
+@pytest.fixture
+def container_on_path(container_shim_dir, monkeypatch):
+    """Fixture making the `container` shim the only command on PATH."""
+    monkeypatch.setenv("PATH", str(container_shim_dir))
+    return container_shim_dir
+
+
+@pytest.fixture
+def container_not_on_path(tmp_path_factory, monkeypatch):
+    """Fixture pointing PATH at an empty directory so `container` cannot be found."""
+    empty_dir = tmp_path_factory.mktemp("empty-bin")
+    monkeypatch.setenv("PATH", str(empty_dir))
+    return empty_dir
+
+
+@pytest.fixture
+def manager():
+    """Fixture providing a fresh ContainerManager instance per test."""
+    return ContainerManager()
 
 
 class TestContainerManager:
     """Tests for ContainerManager class."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.manager = ContainerManager()
+    @pytest.fixture(autouse=True)
+    def run_command_mock(self, monkeypatch):
+        """Fixture replacing cjlib.container._run_command with a mock for every test.
 
-    @patch("shutil.which")
-    def test_check_container_available_returns_true(self, mock_which):
-        """Test that check_container_available returns True when command exists."""
-        mock_which.return_value = "/usr/bin/container"
+        By default the mocked command succeeds with empty output.
+        """
+        mock = Mock(return_value=_Result(0))
+        monkeypatch.setattr("cjlib.container._run_command", mock)
+        return mock
 
-        result = self.manager.check_container_available()
+    def test_check_container_available_returns_true(self, manager, container_on_path):
+        """Test that check_container_available returns True when command exists."""
+        result = manager.check_container_available()
 
         assert result is True
-        mock_which.assert_called_once_with("container")
 
-    @patch("shutil.which")
-    def test_check_container_available_returns_false(self, mock_which):
+    def test_check_container_available_returns_false(self, manager, container_not_on_path):
         """Test that check_container_available returns False when command not found."""
-        mock_which.return_value = None
-
-        result = self.manager.check_container_available()
+        result = manager.check_container_available()
 
         assert result is False
-        mock_which.assert_called_once_with("container")
 
-    @patch("cjlib.container._run_command")
-    def test_build_image_success(self, mock_run):
-        """Test successful image build."""
-        mock_run.return_value = Mock(returncode=0)
+    def test_check_container_available_is_cached(
+        self, manager, container_on_path, tmp_path, monkeypatch
+    ):
+        """Test that the PATH lookup only happens once per manager."""
+        assert manager.check_container_available() is True
 
-        self.manager.build_image("/path/to/Dockerfile", "my-image:latest", "/build/context")
+        # A repeated lookup would no longer find the command
+        monkeypatch.setenv("PATH", str(tmp_path))
 
-        mock_run.assert_called_once_with(
+        assert manager.check_container_available() is True
+
+    def test_build_image_success(self, manager, run_command_mock):
+        """Test successful image build."""
+        manager.build_image("/path/to/Dockerfile", "my-image:latest", "/build/context")
+
+        run_command_mock.assert_called_once_with(
             [
                 "container",
                 "build",
@@ -95,83 +183,100 @@ class TestContainerManager:
                 "-f",
                 "/path/to/Dockerfile",
                 "/build/context",
-            ]
+            ],
+            decode=False,
         )
 
-    @patch("cjlib.container._run_command")
-    def test_build_image_raises_on_failure(self, mock_run):
+    def test_build_image_raises_on_failure(self, manager, run_command_mock):
         """Test that build_image raises ContainerBuildError on failure."""
-        mock_run.side_effect = subprocess.CalledProcessError(1, "container build")
+        run_command_mock.side_effect = subprocess.CalledProcessError(1, "container build")
 
-        with pytest.raises(ContainerBuildError, match="Failed to build image"):
-            self.manager.build_image("/path/to/Dockerfile", "my-image", "/context")
+        with pytest.raises(ContainerBuildError, match=_BUILD_ERR_RE):
+            manager.build_image("/path/to/Dockerfile", "my-image", "/context")
 
-    @patch("cjlib.container._run_command")
-    def test_image_exists_returns_true(self, mock_run):
-        """Test that image_exists returns True when image is found."""
-        mock_run.return_value = Mock(returncode=0, stdout="my-image:latest\nother-image:v1\n")
+    def test_build_image_failure_decodes_output_and_writes_log(
+        self, manager, tmp_path, run_command_mock
+    ):
+        """Test that raw build output is decoded for the error and written to the log."""
+        run_command_mock.side_effect = subprocess.CalledProcessError(
+            1, "container build", output=b"step 1\n", stderr=b"no space left\n"
+        )
+        log_file = tmp_path / "build.log"
+
+        with pytest.raises(ContainerBuildError, match="no space left"):
+            manager.build_image("/path/to/Dockerfile", "my-image", "/context", str(log_file))
 
-        result = self.manager.image_exists("my-image:latest")
+        assert log_file.read_bytes() == b"step 1\nno space left\n"
+
+    def test_image_exists_returns_true(self, manager, run_command_mock):
+        """Test that image_exists returns True when image is found."""
+        result = manager.image_exists("my-image:latest")
 
         assert result is True
-        mock_run.assert_called_once_with(["container", "image", "list"], check=False)
+        run_command_mock.assert_called_once_with(
+            ["container", "image", "inspect", "my-image:latest"], check=False, decode=False
+        )
 
-    @patch("cjlib.container._run_command")
-    def test_image_exists_returns_false(self, mock_run):
+    def test_image_exists_returns_false(self, manager, run_command_mock):
         """Test that image_exists returns False when image not found."""
-        mock_run.return_value = Mock(returncode=0, stdout="other-image:v1\n")
+        run_command_mock.return_value = _Result(1)
 
-        result = self.manager.image_exists("my-image:latest")
+        result = manager.image_exists("my-image:latest")
 
         assert result is False
-        mock_run.assert_called_once_with(["container", "image", "list"], check=False)
+        run_command_mock.assert_called_once_with(
+            ["container", "image", "inspect", "my-image:latest"], check=False, decode=False
+        )
+
+    def test_image_exists_uses_cache(self, manager, run_command_mock):
+        """Test that repeated lookups of the same tag only query the container tool once."""
+        assert manager.image_exists("my-image") is True
+        assert manager.image_exists("my-image") is True
+
+        run_command_mock.assert_called_once()
+
+    @pytest.mark.parametrize("method", ["build_image", "remove_image"])
+    def test_image_cache_invalidated(self, method, manager, run_command_mock):
+        """Test that building or removing an image drops its cached lookup."""
+        run_command_mock.return_value = _Result(1)
+        assert manager.image_exists("my-image") is False
 
-    @patch("cjlib.container._run_command")
-    def test_image_exists_returns_false_on_exception(self, mock_run):
+        if method == "build_image":
+            manager.build_image("/path/to/Dockerfile", "my-image", "/context")
+        else:
+            manager.remove_image("my-image")
+        run_command_mock.return_value = _Result(0)
+
+        assert manager.image_exists("my-image") is True
+        assert run_command_mock.call_count == 3
+
+    def test_image_exists_returns_false_on_exception(self, manager, run_command_mock):
         """Test that image_exists returns False when an exception occurs."""
-        mock_run.side_effect = Exception("Some error")
+        run_command_mock.side_effect = Exception("Some error")
 
-        result = self.manager.image_exists("my-image")
+        result = manager.image_exists("my-image")
 
         assert result is False
 
-    @patch("cjlib.container._run_command")
-    def test_run_interactive_success(self, mock_run):
+    def test_run_interactive_success(self, manager, run_command_mock):
         """Test successful interactive container run."""
-        mock_run.return_value = Mock(returncode=0)
-
-        exit_code = self.manager.run_interactive(
+        exit_code = manager.run_interactive(
             image="my-image:latest",
             working_dir="/workspace",
             volume_mounts=["/host/path:/container/path", "/host/data:/data"],
             command=["bash", "-c", "echo hello"],
         )
 
-        expected_cmd = [
-            "container",
-            "run",
-            "-it",
-            "--rm",
-            "-v",
-            "/host/path:/container/path",
-            "-v",
-            "/host/data:/data",
-            "-w",
-            "/workspace",
-            "my-image:latest",
-            "bash",
-            "-c",
-            "echo hello",
-        ]
-        mock_run.assert_called_once_with(expected_cmd, check=False, capture_output=False)
+        run_command_mock.assert_called_once_with(
+            list(_EXPECTED_RUN_MOUNTS), check=False, capture_output=False
+        )
         assert exit_code == 0
 
-    @patch("cjlib.container._run_command")
-    def test_run_interactive_returns_exit_code(self, mock_run):
+    def test_run_interactive_returns_exit_code(self, manager, run_command_mock):
         """Test that run_interactive returns the container exit code."""
-        mock_run.return_value = Mock(returncode=42)
+        run_command_mock.return_value = _Result(42)
 
-        exit_code = self.manager.run_interactive(
+        exit_code = manager.run_interactive(
             image="my-image",
             working_dir="/workspace",
             volume_mounts=[],
@@ -180,126 +285,88 @@ class TestContainerManager:
 
         assert exit_code == 42
 
-    @patch("cjlib.container._run_command")
-    def test_run_interactive_with_no_mounts(self, mock_run):
+    def test_run_interactive_with_no_mounts(self, manager, run_command_mock):
         """Test run_interactive with no volume mounts."""
-        mock_run.return_value = Mock(returncode=0)
-
-        self.manager.run_interactive(
+        manager.run_interactive(
             image="my-image",
             working_dir="/workspace",
             volume_mounts=[],
             command=["ls"],
         )
 
-        expected_cmd = [
-            "container",
-            "run",
-            "-it",
-            "--rm",
-            "-w",
-            "/workspace",
-            "my-image",
-            "ls",
-        ]
-        mock_run.assert_called_once_with(expected_cmd, check=False, capture_output=False)
-
-    @patch("cjlib.container._run_command")
-    def test_run_interactive_raises_on_exception(self, mock_run):
+        run_command_mock.assert_called_once_with(
+            list(_EXPECTED_RUN_NO_MOUNTS), check=False, capture_output=False
+        )
+
+    def test_run_interactive_raises_on_exception(self, manager, run_command_mock):
         """Test that run_interactive raises ContainerRunError on exception."""
-        mock_run.side_effect = Exception("Failed to run")
+        run_command_mock.side_effect = Exception("Failed to run")
 
-        with pytest.raises(ContainerRunError, match="Failed to run container"):
-            self.manager.run_interactive(
+        with pytest.raises(ContainerRunError, match=_RUN_ERR_RE):
+            manager.run_interactive(
                 image="my-image",
                 working_dir="/workspace",
                 volume_mounts=[],
                 command=["bash"],
             )
 
-    @patch("cjlib.container._run_command")
-    def test_remove_image_success(self, mock_run):
+    def test_remove_image_success(self, manager, run_command_mock):
         """Test successful image removal."""
-        mock_run.return_value = Mock(returncode=0)
-
-        self.manager.remove_image("my-image:latest")
+        manager.remove_image("my-image:latest")
 
-        mock_run.assert_called_once_with(
-            ["container", "image", "delete", "my-image:latest"], check=False
+        run_command_mock.assert_called_once_with(
+            ["container", "image", "delete", "my-image:latest"], check=False, decode=False
         )
 
-    @patch("cjlib.container._run_command")
-    def test_remove_image_ignores_errors(self, mock_run):
+    def test_remove_image_ignores_errors(self, manager, run_command_mock):
         """Test that remove_image doesn't raise errors."""
-        mock_run.side_effect = Exception("Image not found")
+        run_command_mock.side_effect = Exception("Image not found")
 
         # Should not raise an exception
-        self.manager.remove_image("non-existent-image")
+        manager.remove_image("non-existent-image")
 
-        mock_run.assert_called_once_with(
-            ["container", "image", "delete", "non-existent-image"], check=False
+        run_command_mock.assert_called_once_with(
+            ["container", "image", "delete", "non-existent-image"], check=False, decode=False
         )
 
     @pytest.mark.parametrize(
-        "port_forwards,expected_flags",
+        "option_name,option_value,expected_flags",
         [
-            ([("2222", "22"), ("8080", "80")], ["-p", "2222:22", "-p", "8080:80"]),
-            (None, []),
+            (
+                "port_forwards",
+                [("2222", "22"), ("8080", "80")],
+                ["-p", "2222:22", "-p", "8080:80"],
+            ),
+            ("port_forwards", None, []),
+            (
+                "env_vars",
+                ["TERM=xterm-256color", "FOO=bar"],
+                ["-e", "TERM=xterm-256color", "-e", "FOO=bar"],
+            ),
+            ("env_vars", None, []),
         ],
     )
-    @patch("cjlib.container._run_command")
-    def test_run_interactive_port_forwards(self, mock_run, port_forwards, expected_flags):
-        """Test run_interactive with and without port forwarding."""
-        mock_run.return_value = Mock(returncode=0)
-
+    def test_run_interactive_optional_flag(
+        self, option_name, option_value, expected_flags, manager, run_command_mock
+    ):
+        """Test run_interactive with and without port forwarding or environment variables."""
         kwargs = {
             "image": "my-image",
             "working_dir": "/workspace",
             "volume_mounts": ["host:container"],
             "command": ["bash"],
         }
-        if port_forwards is not None:
-            kwargs["port_forwards"] = port_forwards
+        if option_value is not None:
+            kwargs[option_name] = option_value
 
-        self.manager.run_interactive(**kwargs)
+        manager.run_interactive(**kwargs)
 
-        expected_cmd = ["container", "run", "-it", "--rm"] + expected_flags
-        expected_cmd += ["-v", "host:container", "-w", "/workspace", "my-image", "bash"]
-        mock_run.assert_called_once_with(expected_cmd, check=False, capture_output=False)
+        expected_cmd = [*_RUN_PREFIX, *expected_flags, *_RUN_SUFFIX]
+        run_command_mock.assert_called_once_with(expected_cmd, check=False, capture_output=False)
 
-    @pytest.mark.parametrize(
-        "env_vars,expected_flags",
-        [
-            (["TERM=xterm-256color", "FOO=bar"], ["-e", "TERM=xterm-256color", "-e", "FOO=bar"]),
-            (None, []),
-        ],
-    )
-    @patch("cjlib.container._run_command")
-    def test_run_interactive_env_vars(self, mock_run, env_vars, expected_flags):
-        """Test run_interactive with and without environment variables."""
-        mock_run.return_value = Mock(returncode=0)
-
-        kwargs = {
-            "image": "my-image",
-            "working_dir": "/workspace",
-            "volume_mounts": ["host:container"],
-            "command": ["bash"],
-        }
-        if env_vars is not None:
-            kwargs["env_vars"] = env_vars
-
-        self.manager.run_interactive(**kwargs)
-
-        expected_cmd = ["container", "run", "-it", "--rm"] + expected_flags
-        expected_cmd += ["-v", "host:container", "-w", "/workspace", "my-image", "bash"]
-        mock_run.assert_called_once_with(expected_cmd, check=False, capture_output=False)
-
-    @patch("cjlib.container._run_command")
-    def test_run_interactive_with_all_options(self, mock_run):
+    def test_run_interactive_with_all_options(self, manager, run_command_mock):
         """Test run_interactive with all optional parameters."""
-        mock_run.return_value = Mock(returncode=0)
-
-        self.manager.run_interactive(
+        manager.run_interactive(
             image="my-image",
             working_dir="/workspace",
             volume_mounts=["host:container"],
@@ -308,20 +375,6 @@ class TestContainerManager:
             env_vars=["TERM=xterm-256color"],
         )
 
-        expected_cmd = [
-            "container",
-            "run",
-            "-it",
-            "--rm",
-            "-p",
-            "2222:22",
-            "-e",
-            "TERM=xterm-256color",
-            "-v",
-            "host:container",
-            "-w",
-            "/workspace",
-            "my-image",
-            "bash",
-        ]
-        mock_run.assert_called_once_with(expected_cmd, check=False, capture_output=False)
+        run_command_mock.assert_called_once_with(
+            list(_EXPECTED_RUN_FULL), check=False, capture_output=False
+        )
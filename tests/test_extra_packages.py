@@ -1,147 +1,162 @@
 """Tests for extra packages functionality."""
 
+import pytest
 from unittest.mock import Mock, patch
+from cjlib.cli import main
 from cjlib.config import Config, DOCKERFILE_TEMPLATE
 from cjlib.setup import SetupCommand
 from cjlib.update import UpdateCommand
-from cjlib.container import ContainerManager
 
 
-def test_write_and_read_extra_packages(tmp_path):
-    """Test writing and reading extra packages list."""
-    config = Config(str(tmp_path))
-    config_dir = tmp_path / ".cj"
-    config_dir.mkdir()
+def _pkgs_in(content):
+    """Return the set of packages installed by apt-get in Dockerfile content."""
+    return Config(".")._extract_packages_from_dockerfile(content)
+
+
+@pytest.fixture
+def container_mgr(mock_container_manager):
+    """Fixture providing a ContainerManager mock whose container command is available."""
+    mock_container_manager.check_container_available.return_value = True
+    return mock_container_manager
+
+
+@pytest.fixture(scope="session")
+def stateless_config():
+    """Fixture providing one Config for tests that never touch the filesystem."""
+    return Config(".")
+
+
+@pytest.fixture(scope="session")
+def template_packages(stateless_config):
+    """Fixture providing the packages parsed from DOCKERFILE_TEMPLATE."""
+    return stateless_config._extract_packages_from_dockerfile(DOCKERFILE_TEMPLATE)
+
 
+def test_write_and_read_extra_packages(cj):
+    """Test writing and reading extra packages list."""
     packages = ["htop", "tmux", "wget"]
-    config.write_extra_packages(packages)
+    cj.config.write_extra_packages(packages)
 
     # Read back and verify
-    read_packages = config.read_extra_packages()
+    read_packages = cj.config.read_extra_packages()
     assert read_packages == packages
 
 
-def test_read_extra_packages_empty_file(tmp_path):
+def test_read_extra_packages_empty_file(cj):
     """Test reading from empty extra-packages file."""
-    config = Config(str(tmp_path))
-    config_dir = tmp_path / ".cj"
-    config_dir.mkdir()
-
     # Create empty file
-    (config_dir / "extra-packages").write_text("")
+    (cj.dir / "extra-packages").write_text("")
 
-    packages = config.read_extra_packages()
+    packages = cj.config.read_extra_packages()
     assert packages == []
 
 
-def test_read_extra_packages_nonexistent_file(tmp_path):
+def test_read_extra_packages_nonexistent_file(cj):
     """Test reading when extra-packages file doesn't exist."""
-    config = Config(str(tmp_path))
-    config_dir = tmp_path / ".cj"
-    config_dir.mkdir()
-
-    packages = config.read_extra_packages()
+    packages = cj.config.read_extra_packages()
     assert packages == []
 
 
-def test_extract_packages_from_dockerfile():
+def test_extract_packages_from_dockerfile(template_packages):
     """Test extracting packages from Dockerfile."""
-    config = Config(".")
+    # Verify known packages are extracted
+    assert "gcc" in template_packages
+    assert "g++" in template_packages
+    assert "clang" in template_packages
+    assert "python3" in template_packages
+    assert "vim" in template_packages
+    assert "neovim" in template_packages
+    assert "zsh" in template_packages
+    assert "curl" in template_packages
+    assert "git" in template_packages
 
-    packages = config._extract_packages_from_dockerfile(DOCKERFILE_TEMPLATE)
 
-    # Verify known packages are extracted
-    assert "gcc" in packages
-    assert "g++" in packages
-    assert "clang" in packages
-    assert "python3" in packages
-    assert "vim" in packages
-    assert "neovim" in packages
-    assert "zsh" in packages
-    assert "curl" in packages
-    assert "git" in packages
-
-
-def test_generate_dockerfile_with_new_packages(tmp_path):
-    """Test generating Dockerfile with new packages."""
-    config = Config(str(tmp_path))
+def test_extract_packages_from_dockerfile_is_cached(stateless_config):
+    """Test that parsing the same Dockerfile content twice reuses the cached result."""
+    first = stateless_config._extract_packages_from_dockerfile(DOCKERFILE_TEMPLATE)
+    second = Config(".")._extract_packages_from_dockerfile(DOCKERFILE_TEMPLATE)
+
+    assert second is first
+
 
+def test_generate_dockerfile_with_new_packages(stateless_config):
+    """Test generating Dockerfile with new packages."""
     # Generate with new packages
-    content = config._generate_dockerfile_with_packages(["htop", "tmux", "wget"])
+    content = stateless_config._generate_dockerfile_with_packages(["htop", "tmux", "wget"])
 
-    # Verify new packages are added
-    assert "htop" in content
-    assert "tmux" in content
-    assert "wget" in content
+    # Verify new packages are added to the apt-get install list
+    assert {"htop", "tmux", "wget"} <= _pkgs_in(content)
 
     # Verify base template is still there
     assert "FROM ubuntu:25.04" in content
     assert "claude-code" in content
 
 
-def test_generate_dockerfile_with_duplicate_packages(tmp_path):
+def test_generate_dockerfile_with_duplicate_packages(stateless_config):
     """Test that duplicate packages are filtered out."""
-    config = Config(str(tmp_path))
-
     # Try to add packages that already exist in template
-    content = config._generate_dockerfile_with_packages(["gcc", "git", "curl"])
+    content = stateless_config._generate_dockerfile_with_packages(["gcc", "git", "curl"])
 
     # Should return unchanged template since all packages already exist
     assert content == DOCKERFILE_TEMPLATE
 
 
-def test_generate_dockerfile_with_mixed_packages(tmp_path):
+def test_generate_dockerfile_with_mixed_packages(stateless_config):
     """Test with both new and existing packages."""
-    config = Config(str(tmp_path))
-
     # Mix of existing and new packages
-    content = config._generate_dockerfile_with_packages(["gcc", "htop", "python3", "tmux"])
+    content = stateless_config._generate_dockerfile_with_packages(
+        ["gcc", "htop", "python3", "tmux"]
+    )
 
-    # New packages should be added
-    assert "htop" in content
-    assert "tmux" in content
+    # New packages should be added; gcc and python3 are already in the apt-get install list
+    assert {"gcc", "htop", "python3", "tmux"} <= _pkgs_in(content)
 
-    # Verify gcc and python3 are in the apt-get install line (they're already there)
-    assert "gcc" in content
-    assert "python3" in content
 
+def test_generate_dockerfile_adds_packages_to_first_block_only(stateless_config):
+    """Test that new packages are added once, to the first apt-get install block."""
+    content = stateless_config._generate_dockerfile_with_packages(["htop", "tmux"])
+    lines = content.split("\n")
+    template_lines = DOCKERFILE_TEMPLATE.split("\n")
 
-def test_generate_and_write_dockerfile_without_extra_packages(tmp_path):
-    """Test generating Dockerfile without extra packages."""
-    config = Config(str(tmp_path))
-    config_dir = tmp_path / ".cj"
-    config_dir.mkdir()
+    # The first block runs from its apt-get install line to the line that ends it
+    block_start = next(i for i, line in enumerate(lines) if "apt-get install" in line)
+    block_end = next(
+        i for i in range(block_start, len(lines)) if not lines[i].strip().endswith("\\")
+    )
+    added = ["    htop \\", "    tmux \\"]
+    for line in added:
+        assert lines.count(line) == 1
+        assert block_start < lines.index(line) < block_end
+
+    # Apart from the added lines, the template, including the nodejs install, is unchanged
+    assert [line for line in lines if line not in added] == template_lines
 
-    config.generate_and_write_dockerfile()
 
-    dockerfile_path = config_dir / "Dockerfile"
-    assert dockerfile_path.exists()
+@pytest.mark.real_fs
+def test_generate_and_write_dockerfile_without_extra_packages(cj):
+    """Test generating Dockerfile without extra packages."""
+    cj.config.generate_and_write_dockerfile()
+
+    assert cj.dockerfile.exists()
 
-    content = dockerfile_path.read_text()
+    content = cj.dockerfile.read_text()
     assert content == DOCKERFILE_TEMPLATE
 
 
-def test_generate_and_write_dockerfile_with_extra_packages(tmp_path):
+@pytest.mark.real_fs
+def test_generate_and_write_dockerfile_with_extra_packages(cj):
     """Test generating Dockerfile with extra packages."""
-    config = Config(str(tmp_path))
-    config_dir = tmp_path / ".cj"
-    config_dir.mkdir()
-
-    config.generate_and_write_dockerfile(["htop", "tmux"])
+    cj.config.generate_and_write_dockerfile(["htop", "tmux"])
 
-    dockerfile_path = config_dir / "Dockerfile"
-    assert dockerfile_path.exists()
+    assert cj.dockerfile.exists()
 
-    content = dockerfile_path.read_text()
-    assert "htop" in content
-    assert "tmux" in content
+    assert {"htop", "tmux"} <= _pkgs_in(cj.dockerfile.read_text())
 
 
-def test_setup_with_extra_packages(tmp_path):
+@pytest.mark.real_fs
+def test_setup_with_extra_packages(tmp_path, container_mgr):
     """Test setup command with extra packages."""
     config = Config(str(tmp_path))
-    container_mgr = Mock(spec=ContainerManager)
-    container_mgr.check_container_available.return_value = True
 
     setup_cmd = SetupCommand(config, container_mgr)
 
@@ -157,17 +172,12 @@ def test_setup_with_extra_packages(tmp_path):
 
     # Verify Dockerfile contains the packages
     dockerfile_path = tmp_path / ".cj" / "Dockerfile"
-    content = dockerfile_path.read_text()
-    assert "htop" in content
-    assert "tmux" in content
-    assert "wget" in content
+    assert {"htop", "tmux", "wget"} <= _pkgs_in(dockerfile_path.read_text())
 
 
-def test_setup_without_extra_packages(tmp_path):
+def test_setup_without_extra_packages(tmp_path, container_mgr):
     """Test setup command without extra packages."""
     config = Config(str(tmp_path))
-    container_mgr = Mock(spec=ContainerManager)
-    container_mgr.check_container_available.return_value = True
 
     setup_cmd = SetupCommand(config, container_mgr)
 
@@ -182,128 +192,53 @@ def test_setup_without_extra_packages(tmp_path):
     assert stored_packages == []
 
 
-def test_update_with_new_extra_packages(tmp_path):
-    """Test update command adding new extra packages."""
-    config = Config(str(tmp_path))
-    config_dir = tmp_path / ".cj"
-    config_dir.mkdir()
-
+@pytest.mark.real_fs
+@pytest.mark.parametrize(
+    "update_arg,expected_set",
+    [
+        (["wget", "ncdu"], {"htop", "tmux", "wget", "ncdu"}),
+        (["tmux", "wget", "htop"], {"htop", "tmux", "wget"}),
+        (None, {"htop", "tmux"}),
+    ],
+    ids=["new_packages", "duplicate_packages", "no_new_packages"],
+)
+def test_update_extra_packages(cj, container_mgr, update_arg, expected_set):
+    """Test that update merges new extra packages with the stored ones without duplicates."""
     # Setup initial state with some packages
-    config.write_image_name("cj-test-image")
-    config.write_extra_packages(["htop", "tmux"])
+    cj.config.write_image_name("cj-test-image")
+    cj.config.write_extra_packages(["htop", "tmux"])
 
-    container_mgr = Mock(spec=ContainerManager)
-    update_cmd = UpdateCommand(config, container_mgr)
+    update_cmd = UpdateCommand(cj.config, container_mgr)
 
-    # Run update with additional packages
-    result = update_cmd.run(extra_packages=["wget", "ncdu"])
-
-    # Verify success
-    assert result == 0
-
-    # Verify packages were merged
-    stored_packages = config.read_extra_packages()
-    assert set(stored_packages) == {"htop", "tmux", "wget", "ncdu"}
-
-    # Verify Dockerfile contains all packages
-    dockerfile_path = config_dir / "Dockerfile"
-    content = dockerfile_path.read_text()
-    assert "htop" in content
-    assert "tmux" in content
-    assert "wget" in content
-    assert "ncdu" in content
-
-
-def test_update_with_duplicate_extra_packages(tmp_path):
-    """Test update command with duplicate packages."""
-    config = Config(str(tmp_path))
-    config_dir = tmp_path / ".cj"
-    config_dir.mkdir()
-
-    # Setup initial state
-    config.write_image_name("cj-test-image")
-    config.write_extra_packages(["htop", "tmux"])
-
-    container_mgr = Mock(spec=ContainerManager)
-    update_cmd = UpdateCommand(config, container_mgr)
-
-    # Run update with some duplicate packages
-    result = update_cmd.run(extra_packages=["tmux", "wget", "htop"])
+    result = update_cmd.run(extra_packages=update_arg)
 
     # Verify success
     assert result == 0
 
     # Verify packages were merged (no duplicates in stored list)
-    stored_packages = config.read_extra_packages()
-    assert set(stored_packages) == {"htop", "tmux", "wget"}
-
-    # Verify all packages are present in Dockerfile
-    dockerfile_path = config_dir / "Dockerfile"
-    content = dockerfile_path.read_text()
-    assert "htop" in content
-    assert "tmux" in content
-    assert "wget" in content
-
+    stored_packages = cj.config.read_extra_packages()
+    assert len(stored_packages) == len(expected_set)
+    assert set(stored_packages) == expected_set
 
-def test_update_without_new_extra_packages_preserves_existing(tmp_path):
-    """Test update command without new packages preserves existing ones."""
-    config = Config(str(tmp_path))
-    config_dir = tmp_path / ".cj"
-    config_dir.mkdir()
+    # Verify Dockerfile contains all packages
+    assert expected_set <= _pkgs_in(cj.dockerfile.read_text())
 
-    # Setup initial state with packages
-    config.write_image_name("cj-test-image")
-    config.write_extra_packages(["htop", "tmux"])
 
-    container_mgr = Mock(spec=ContainerManager)
-    update_cmd = UpdateCommand(config, container_mgr)
+@pytest.mark.parametrize(
+    "cmd_name,patch_target,arg,expected",
+    [
+        ("setup", "cjlib.cli.SetupCommand", "htop tmux wget", ["htop", "tmux", "wget"]),
+        ("update", "cjlib.cli.UpdateCommand", "ncdu tree", ["ncdu", "tree"]),
+    ],
+)
+def test_cli_extra_packages_parsing(monkeypatch, cmd_name, patch_target, arg, expected):
+    """Test CLI parsing of --extra-packages for the setup and update commands."""
+    mock_cmd = Mock(run=Mock(return_value=0))
+    monkeypatch.setattr(patch_target, Mock(return_value=mock_cmd))
+    monkeypatch.setattr("sys.argv", ["cj", cmd_name, "--extra-packages", arg])
 
-    # Run update without new packages
-    result = update_cmd.run(extra_packages=None)
+    result = main()
 
-    # Verify success
+    # Verify the command was run with the parsed packages
     assert result == 0
-
-    # Verify existing packages are preserved
-    stored_packages = config.read_extra_packages()
-    assert set(stored_packages) == {"htop", "tmux"}
-
-    # Verify Dockerfile contains existing packages
-    dockerfile_path = config_dir / "Dockerfile"
-    content = dockerfile_path.read_text()
-    assert "htop" in content
-    assert "tmux" in content
-
-
-def test_cli_setup_with_extra_packages_parsing():
-    """Test CLI parsing of --extra-packages for setup command."""
-    from cjlib.cli import main
-
-    with patch("cjlib.cli.SetupCommand") as mock_setup:
-        with patch("sys.argv", ["cj", "setup", "--extra-packages", "htop tmux wget"]):
-            mock_cmd = Mock()
-            mock_cmd.run.return_value = 0
-            mock_setup.return_value = mock_cmd
-
-            result = main()
-
-            # Verify setup was called with parsed packages
-            assert result == 0
-            mock_cmd.run.assert_called_once_with(["htop", "tmux", "wget"])
-
-
-def test_cli_update_with_extra_packages_parsing():
-    """Test CLI parsing of --extra-packages for update command."""
-    from cjlib.cli import main
-
-    with patch("cjlib.cli.UpdateCommand") as mock_update:
-        with patch("sys.argv", ["cj", "update", "--extra-packages", "ncdu tree"]):
-            mock_cmd = Mock()
-            mock_cmd.run.return_value = 0
-            mock_update.return_value = mock_cmd
-
-            result = main()
-
-            # Verify update was called with parsed packages
-            assert result == 0
-            mock_cmd.run.assert_called_once_with(["ncdu", "tree"])
+    mock_cmd.run.assert_called_once_with(expected)
@@ -1,11 +1,34 @@
 """Tests for setup mode implementation."""
 
-from unittest.mock import Mock, patch
+import types
+import pytest
+from unittest.mock import patch
 from cjlib.setup import SetupCommand, CLAUDE_MD_TEMPLATE
 from cjlib.config import Config, DOCKERFILE_TEMPLATE
-from cjlib.container import ContainerManager
 
 
+@pytest.fixture(autouse=True)
+def generated_name():
+    """Fixture pinning the image name picked by setup to cj-test-image."""
+    with patch("cjlib.setup.generate_name", return_value="cj-test-image") as mock:
+        yield mock
+
+
+@pytest.fixture
+def setup_env(tmp_path, mock_config, mock_container_manager):
+    """Fixture providing a SetupCommand wired to mocks for a project in tmp_path."""
+    mock_config.exists.return_value = False
+    mock_container_manager.check_container_available.return_value = True
+
+    return types.SimpleNamespace(
+        config=mock_config,
+        container_mgr=mock_container_manager,
+        setup_cmd=SetupCommand(mock_config, mock_container_manager),
+        config_dir=tmp_path / ".cj",
+    )
+
+
+@pytest.mark.real_fs
 def test_generate_dockerfile(tmp_path):
     """Test Dockerfile generation."""
     config = Config(str(tmp_path))
@@ -36,11 +59,9 @@ def test_dockerfile_template_content():
     assert "WORKDIR /workspace" in DOCKERFILE_TEMPLATE
 
 
-def test_generate_claude_md(tmp_path):
+def test_generate_claude_md(tmp_path, mock_config, mock_container_manager):
     """Test CLAUDE.md generation."""
-    config = Mock(spec=Config)
-    container_mgr = Mock(spec=ContainerManager)
-    setup_cmd = SetupCommand(config, container_mgr)
+    setup_cmd = SetupCommand(mock_config, mock_container_manager)
 
     claude_md_path = tmp_path / "CLAUDE.md"
     setup_cmd._generate_claude_md(str(claude_md_path))
@@ -65,184 +86,72 @@ def test_claude_md_template_content():
     assert "cargo clippy" in CLAUDE_MD_TEMPLATE
 
 
-def test_cleanup_on_failure():
+def test_cleanup_on_failure(mock_config, mock_container_manager):
     """Test cleanup removes .cj directory on failure."""
-    config = Mock(spec=Config)
-    container_mgr = Mock(spec=ContainerManager)
-    setup_cmd = SetupCommand(config, container_mgr)
+    setup_cmd = SetupCommand(mock_config, mock_container_manager)
 
     setup_cmd._cleanup_on_failure()
 
-    config.cleanup.assert_called_once()
+    mock_config.cleanup.assert_called_once()
 
 
-def test_cleanup_on_failure_ignores_errors():
+def test_cleanup_on_failure_ignores_errors(mock_config, mock_container_manager):
     """Test cleanup ignores errors during cleanup."""
-    config = Mock(spec=Config)
-    config.cleanup.side_effect = Exception("Cleanup failed")
-    container_mgr = Mock(spec=ContainerManager)
-    setup_cmd = SetupCommand(config, container_mgr)
+    mock_config.cleanup.side_effect = Exception("Cleanup failed")
+    setup_cmd = SetupCommand(mock_config, mock_container_manager)
 
     # Should not raise exception
     setup_cmd._cleanup_on_failure()
 
 
-def test_run_success(tmp_path):
-    """Test successful setup flow."""
-    config_dir = tmp_path / ".cj"
-
-    config = Mock(spec=Config)
-    config.exists.return_value = False
-    config.get_config_dir.return_value = str(config_dir)
-    config.get_dockerfile_path.return_value = str(config_dir / "Dockerfile")
-
-    container_mgr = Mock(spec=ContainerManager)
-    container_mgr.check_container_available.return_value = True
-
-    setup_cmd = SetupCommand(config, container_mgr)
-
-    with patch("cjlib.setup.generate_name", return_value="cj-test-image"):
-        result = setup_cmd.run()
-
-    # Verify success
-    assert result == 0
-
-    # Verify correct flow
-    container_mgr.check_container_available.assert_called_once()
-    config.get_dockerfile_path.assert_called()
-    container_mgr.build_image.assert_called_once()
-    config.write_image_name.assert_called_once_with("cj-test-image")
-
-
-def test_run_config_already_exists(tmp_path):
-    """Test failure when Dockerfile already exists."""
-    config_dir = tmp_path / ".cj"
-    config_dir.mkdir()
-    dockerfile_path = config_dir / "Dockerfile"
-    dockerfile_path.write_text("test")
-
-    config = Mock(spec=Config)
-    config.get_dockerfile_path.return_value = str(dockerfile_path)
-
-    container_mgr = Mock(spec=ContainerManager)
-    setup_cmd = SetupCommand(config, container_mgr)
-
-    result = setup_cmd.run()
-
-    # Verify failure
-    assert result == 1
-
-    # Verify container operations not called
-    container_mgr.check_container_available.assert_not_called()
-    container_mgr.build_image.assert_not_called()
-
-
-def test_run_container_not_available(tmp_path):
-    """Test failure when container command not available."""
-    config = Mock(spec=Config)
-    config.get_dockerfile_path.return_value = str(tmp_path / ".cj" / "Dockerfile")
-
-    container_mgr = Mock(spec=ContainerManager)
-    container_mgr.check_container_available.return_value = False
-
-    setup_cmd = SetupCommand(config, container_mgr)
-
-    result = setup_cmd.run()
-
-    # Verify failure
-    assert result == 1
-
-    # Verify build not attempted
-    container_mgr.build_image.assert_not_called()
-
-
-def test_run_build_failure_cleanup(tmp_path):
-    """Test cleanup on build failure."""
-    config = Mock(spec=Config)
-    config.exists.return_value = False
-    config.get_config_dir.return_value = str(tmp_path / ".cj")
-    config.get_dockerfile_path.return_value = str(tmp_path / ".cj" / "Dockerfile")
-
-    container_mgr = Mock(spec=ContainerManager)
-    container_mgr.check_container_available.return_value = True
-    container_mgr.build_image.side_effect = Exception("Build failed")
-
-    setup_cmd = SetupCommand(config, container_mgr)
-
-    with patch("cjlib.setup.generate_name", return_value="cj-test-image"):
-        result = setup_cmd.run()
-
-    # Verify failure
-    assert result == 1
-
-    # Verify cleanup was called
-    config.cleanup.assert_called_once()
-
-    # Verify image name not written
+@pytest.mark.parametrize(
+    "scenario,expected_result",
+    [
+        ("success", 0),
+        ("config_exists", 1),
+        ("container_not_available", 1),
+        ("build_fails", 1),
+    ],
+)
+def test_run(setup_env, scenario, expected_result):
+    """Test the setup flow on success and on each failure path."""
+    config, container_mgr = setup_env.config, setup_env.container_mgr
+    if scenario == "config_exists":
+        setup_env.config_dir.mkdir()
+        (setup_env.config_dir / "Dockerfile").write_text("test")
+    elif scenario == "container_not_available":
+        container_mgr.check_container_available.return_value = False
+    elif scenario == "build_fails":
+        container_mgr.build_image.side_effect = Exception("Build failed")
+
+    result = setup_env.setup_cmd.run()
+
+    assert result == expected_result
+
+    if scenario == "success":
+        # Verify build_image called with correct params and the image name stored
+        container_mgr.check_container_available.assert_called_once()
+        container_mgr.build_image.assert_called_once_with(
+            str(setup_env.config_dir / "Dockerfile"),
+            "cj-test-image",
+            str(setup_env.config_dir.parent),
+            str(setup_env.config_dir / "build.log"),
+        )
+        config.write_image_name.assert_called_once_with("cj-test-image")
+        return
+
+    # Verify image name not written on any failure
     config.write_image_name.assert_not_called()
+    if scenario == "config_exists":
+        container_mgr.check_container_available.assert_not_called()
+    if scenario == "build_fails":
+        config.cleanup.assert_called_once()
+    else:
+        container_mgr.build_image.assert_not_called()
 
 
-def test_run_image_name_written_with_correct_value(tmp_path):
-    """Test image name is written correctly."""
-    config_dir = tmp_path / ".cj"
-
-    config = Mock(spec=Config)
-    config.exists.return_value = False
-    config.get_config_dir.return_value = str(config_dir)
-    config.get_dockerfile_path.return_value = str(config_dir / "Dockerfile")
-
-    # Mock create_config_dir to actually create the directory
-    def create_dir():
-        config_dir.mkdir(parents=True, exist_ok=True)
-
-    config.create_config_dir.side_effect = create_dir
-
-    container_mgr = Mock(spec=ContainerManager)
-    container_mgr.check_container_available.return_value = True
-
-    setup_cmd = SetupCommand(config, container_mgr)
-
-    with patch("cjlib.setup.generate_name", return_value="cj-happy-turtle"):
-        result = setup_cmd.run()
-
-    # Verify image name written correctly
-    assert result == 0
-    config.write_image_name.assert_called_once_with("cj-happy-turtle")
-
-
-def test_run_build_image_called_with_correct_params(tmp_path):
-    """Test build_image is called with correct parameters."""
-    config_dir = tmp_path / ".cj"
-    dockerfile_path = str(config_dir / "Dockerfile")
-
-    config = Mock(spec=Config)
-    config.exists.return_value = False
-    config.get_config_dir.return_value = str(config_dir)
-    config.get_dockerfile_path.return_value = dockerfile_path
-
-    # Mock create_config_dir to actually create the directory
-    def create_dir():
-        config_dir.mkdir(parents=True, exist_ok=True)
-
-    config.create_config_dir.side_effect = create_dir
-
-    container_mgr = Mock(spec=ContainerManager)
-    container_mgr.check_container_available.return_value = True
-
-    setup_cmd = SetupCommand(config, container_mgr)
-
-    with patch("cjlib.setup.generate_name", return_value="cj-test-image"):
-        result = setup_cmd.run()
-
-    # Verify build_image called with correct params
-    assert result == 0
-    expected_log_file = str(config_dir / "build.log")
-    container_mgr.build_image.assert_called_once_with(
-        dockerfile_path, "cj-test-image", str(tmp_path), expected_log_file
-    )
-
-
-def test_run_dockerfile_written_before_build(tmp_path):
+@pytest.mark.real_fs
+def test_run_dockerfile_written_before_build(tmp_path, mock_container_manager):
     """Test that Dockerfile is written before image build."""
     dockerfile_path = tmp_path / ".cj" / "Dockerfile"
     dockerfile_path.parent.mkdir(parents=True)
@@ -250,8 +159,7 @@ def test_run_dockerfile_written_before_build(tmp_path):
     # Use real Config to actually write Dockerfile
     config = Config(str(tmp_path))
 
-    container_mgr = Mock(spec=ContainerManager)
-    container_mgr.check_container_available.return_value = True
+    mock_container_manager.check_container_available.return_value = True
 
     # Track if Dockerfile exists when build_image is called
     dockerfile_exists_during_build = False
@@ -260,35 +168,22 @@ def test_run_dockerfile_written_before_build(tmp_path):
         nonlocal dockerfile_exists_during_build
         dockerfile_exists_during_build = dockerfile_path.exists()
 
-    container_mgr.build_image.side_effect = check_dockerfile
+    mock_container_manager.build_image.side_effect = check_dockerfile
 
-    setup_cmd = SetupCommand(config, container_mgr)
+    setup_cmd = SetupCommand(config, mock_container_manager)
 
-    with patch("cjlib.setup.generate_name", return_value="cj-test-image"):
-        result = setup_cmd.run()
+    result = setup_cmd.run()
 
     # Verify Dockerfile exists when build is called
     assert result == 0
     assert dockerfile_exists_during_build
 
 
-def test_run_creates_claude_md(tmp_path):
+def test_run_creates_claude_md(setup_env):
     """Test that setup creates CLAUDE.md if it doesn't exist."""
-    config_dir = tmp_path / ".cj"
-    claude_md_path = tmp_path / "CLAUDE.md"
-
-    config = Mock(spec=Config)
-    config.exists.return_value = False
-    config.get_config_dir.return_value = str(config_dir)
-    config.get_dockerfile_path.return_value = str(config_dir / "Dockerfile")
-
-    container_mgr = Mock(spec=ContainerManager)
-    container_mgr.check_container_available.return_value = True
+    claude_md_path = setup_env.config_dir.parent / "CLAUDE.md"
 
-    setup_cmd = SetupCommand(config, container_mgr)
-
-    with patch("cjlib.setup.generate_name", return_value="cj-test-image"):
-        result = setup_cmd.run()
+    result = setup_env.setup_cmd.run()
 
     # Verify CLAUDE.md was created
     assert result == 0
@@ -297,27 +192,15 @@ def test_run_creates_claude_md(tmp_path):
     assert content == CLAUDE_MD_TEMPLATE
 
 
-def test_run_does_not_overwrite_existing_claude_md(tmp_path):
+def test_run_does_not_overwrite_existing_claude_md(setup_env):
     """Test that setup does not overwrite existing CLAUDE.md."""
-    config_dir = tmp_path / ".cj"
-    claude_md_path = tmp_path / "CLAUDE.md"
+    claude_md_path = setup_env.config_dir.parent / "CLAUDE.md"
 
     # Create existing CLAUDE.md with custom content
     existing_content = "# Custom CLAUDE.md\nThis should not be overwritten."
     claude_md_path.write_text(existing_content)
 
-    config = Mock(spec=Config)
-    config.exists.return_value = False
-    config.get_config_dir.return_value = str(config_dir)
-    config.get_dockerfile_path.return_value = str(config_dir / "Dockerfile")
-
-    container_mgr = Mock(spec=ContainerManager)
-    container_mgr.check_container_available.return_value = True
-
-    setup_cmd = SetupCommand(config, container_mgr)
-
-    with patch("cjlib.setup.generate_name", return_value="cj-test-image"):
-        result = setup_cmd.run()
+    result = setup_env.setup_cmd.run()
 
     # Verify CLAUDE.md was not overwritten
     assert result == 0
@@ -1,42 +1,29 @@
 """Tests for update mode implementation."""
 
-from unittest.mock import Mock
+import pytest
 from cjlib.update import UpdateCommand
-from cjlib.config import Config, ConfigNotFoundError, DOCKERFILE_TEMPLATE
-from cjlib.container import ContainerManager
+from cjlib.config import ConfigNotFoundError, DOCKERFILE_TEMPLATE
 
 
-def test_regenerate_dockerfile(tmp_path):
+@pytest.mark.real_fs
+def test_regenerate_dockerfile(cj):
     """Test Dockerfile regeneration."""
-    config = Config(str(tmp_path))
-    config_dir = tmp_path / ".cj"
-    config_dir.mkdir()
-
-    config.generate_and_write_dockerfile()
+    cj.config.generate_and_write_dockerfile()
 
-    dockerfile_path = config_dir / "Dockerfile"
     # Verify file was created with correct content
-    assert dockerfile_path.exists()
-    content = dockerfile_path.read_text()
+    assert cj.dockerfile.exists()
+    content = cj.dockerfile.read_text()
     assert content == DOCKERFILE_TEMPLATE
 
 
-def test_run_success(tmp_path):
+def test_run_success(mock_config, mock_container_manager):
     """Test successful update flow."""
-    config_dir = tmp_path / ".cj"
-    config_dir.mkdir(parents=True, exist_ok=True)
-
-    config = Mock(spec=Config)
-    config.exists.return_value = True
-    config.read_image_name.return_value = "cj-test-image"
-    config.get_config_dir.return_value = str(config_dir)
-    config.get_dockerfile_path.return_value = str(config_dir / "Dockerfile")
-    config.read_extra_packages.return_value = []
-    config.generate_and_write_dockerfile.return_value = None
+    mock_config.exists.return_value = True
+    mock_config.read_image_name.return_value = "cj-test-image"
+    mock_config.read_extra_packages.return_value = []
+    mock_config.generate_and_write_dockerfile.return_value = None
 
-    container_mgr = Mock(spec=ContainerManager)
-
-    update_cmd = UpdateCommand(config, container_mgr)
+    update_cmd = UpdateCommand(mock_config, mock_container_manager)
 
     result = update_cmd.run()
 
@@ -44,21 +31,19 @@ def test_run_success(tmp_path):
     assert result == 0
 
     # Verify correct flow
-    config.exists.assert_called_once()
-    config.read_image_name.assert_called_once()
-    config.read_extra_packages.assert_called_once()
-    config.generate_and_write_dockerfile.assert_called_once()
-    config.get_dockerfile_path.assert_called_once()
-    container_mgr.build_image.assert_called_once()
+    mock_config.exists.assert_called_once()
+    mock_config.read_image_name.assert_called_once()
+    mock_config.read_extra_packages.assert_called_once()
+    mock_config.generate_and_write_dockerfile.assert_called_once()
+    mock_config.get_dockerfile_path.assert_called_once()
+    mock_container_manager.build_image.assert_called_once()
 
 
-def test_run_no_config():
+def test_run_no_config(mock_config, mock_container_manager):
     """Test failure when .cj directory doesn't exist."""
-    config = Mock(spec=Config)
-    config.exists.return_value = False
+    mock_config.exists.return_value = False
 
-    container_mgr = Mock(spec=ContainerManager)
-    update_cmd = UpdateCommand(config, container_mgr)
+    update_cmd = UpdateCommand(mock_config, mock_container_manager)
 
     result = update_cmd.run()
 
@@ -66,18 +51,16 @@ def test_run_no_config():
     assert result == 1
 
     # Verify no operations performed
-    config.read_image_name.assert_not_called()
-    container_mgr.build_image.assert_not_called()
+    mock_config.read_image_name.assert_not_called()
+    mock_container_manager.build_image.assert_not_called()
 
 
-def test_run_image_name_not_found():
+def test_run_image_name_not_found(mock_config, mock_container_manager):
     """Test failure when image name file doesn't exist."""
-    config = Mock(spec=Config)
-    config.exists.return_value = True
-    config.read_image_name.side_effect = ConfigNotFoundError("Image name not found")
+    mock_config.exists.return_value = True
+    mock_config.read_image_name.side_effect = ConfigNotFoundError("Image name not found")
 
-    container_mgr = Mock(spec=ContainerManager)
-    update_cmd = UpdateCommand(config, container_mgr)
+    update_cmd = UpdateCommand(mock_config, mock_container_manager)
 
     result = update_cmd.run()
 
@@ -85,26 +68,19 @@ def test_run_image_name_not_found():
     assert result == 1
 
     # Verify build not called
-    container_mgr.build_image.assert_not_called()
+    mock_container_manager.build_image.assert_not_called()
 
 
-def test_run_build_failure(tmp_path):
+def test_run_build_failure(mock_config, mock_container_manager):
     """Test failure when image build fails."""
-    config_dir = tmp_path / ".cj"
-    config_dir.mkdir(parents=True, exist_ok=True)
+    mock_config.exists.return_value = True
+    mock_config.read_image_name.return_value = "cj-test-image"
+    mock_config.read_extra_packages.return_value = []
+    mock_config.generate_and_write_dockerfile.return_value = None
 
-    config = Mock(spec=Config)
-    config.exists.return_value = True
-    config.read_image_name.return_value = "cj-test-image"
-    config.get_config_dir.return_value = str(config_dir)
-    config.get_dockerfile_path.return_value = str(config_dir / "Dockerfile")
-    config.read_extra_packages.return_value = []
-    config.generate_and_write_dockerfile.return_value = None
+    mock_container_manager.build_image.side_effect = RuntimeError("Build failed")
 
-    container_mgr = Mock(spec=ContainerManager)
-    container_mgr.build_image.side_effect = Exception("Build failed")
-
-    update_cmd = UpdateCommand(config, container_mgr)
+    update_cmd = UpdateCommand(mock_config, mock_container_manager)
 
     result = update_cmd.run()
 
@@ -112,83 +88,61 @@ def test_run_build_failure(tmp_path):
     assert result == 1
 
 
-def test_run_same_image_name_reused(tmp_path):
+def test_run_same_image_name_reused(mock_config, mock_container_manager):
     """Test that the same image name is reused during update."""
-    config_dir = tmp_path / ".cj"
-    config_dir.mkdir(parents=True, exist_ok=True)
+    mock_config.exists.return_value = True
+    mock_config.read_image_name.return_value = "cj-happy-turtle"
+    mock_config.read_extra_packages.return_value = []
+    mock_config.generate_and_write_dockerfile.return_value = None
 
-    config = Mock(spec=Config)
-    config.exists.return_value = True
-    config.read_image_name.return_value = "cj-happy-turtle"
-    config.get_config_dir.return_value = str(config_dir)
-    config.get_dockerfile_path.return_value = str(config_dir / "Dockerfile")
-    config.read_extra_packages.return_value = []
-    config.generate_and_write_dockerfile.return_value = None
-
-    container_mgr = Mock(spec=ContainerManager)
-
-    update_cmd = UpdateCommand(config, container_mgr)
+    update_cmd = UpdateCommand(mock_config, mock_container_manager)
 
     result = update_cmd.run()
 
     # Verify same image name used for rebuild
     assert result == 0
-    container_mgr.build_image.assert_called_once()
-    call_args = container_mgr.build_image.call_args
-    assert call_args[0][1] == "cj-happy-turtle"  # Second arg is tag
+    mock_container_manager.build_image.assert_called_once()
+    call_args = mock_container_manager.build_image.call_args
+    assert call_args.args[1] == "cj-happy-turtle"  # Second arg is tag
 
 
-def test_run_dockerfile_regenerated(tmp_path):
+@pytest.mark.real_fs
+def test_run_dockerfile_regenerated(cj, mock_container_manager):
     """Test that Dockerfile is regenerated during update."""
-    config_dir = tmp_path / ".cj"
-    config_dir.mkdir(parents=True, exist_ok=True)
-    dockerfile_path = config_dir / "Dockerfile"
-
     # Create existing Dockerfile with custom content
-    dockerfile_path.write_text("# Custom Dockerfile\nFROM custom:image\n")
-
-    # Use real Config for this test to actually write the file
-    config = Config(str(tmp_path))
+    cj.dockerfile.write_text("# Custom Dockerfile\nFROM custom:image\n")
 
     # Write image name file (required for update to work)
-    config.write_image_name("cj-test-image")
-
-    container_mgr = Mock(spec=ContainerManager)
+    cj.config.write_image_name("cj-test-image")
 
-    update_cmd = UpdateCommand(config, container_mgr)
+    update_cmd = UpdateCommand(cj.config, mock_container_manager)
 
     result = update_cmd.run()
 
     # Verify Dockerfile was regenerated (user customizations lost)
     assert result == 0
-    content = dockerfile_path.read_text()
+    content = cj.dockerfile.read_text()
     assert content == DOCKERFILE_TEMPLATE
     assert "# Custom Dockerfile" not in content
 
 
-def test_run_build_image_called_with_correct_params(tmp_path):
+def test_run_build_image_called_with_correct_params(tmp_path, mock_config, mock_container_manager):
     """Test build_image is called with correct parameters."""
     config_dir = tmp_path / ".cj"
-    config_dir.mkdir(parents=True, exist_ok=True)
     dockerfile_path = str(config_dir / "Dockerfile")
 
-    config = Mock(spec=Config)
-    config.exists.return_value = True
-    config.read_image_name.return_value = "cj-test-image"
-    config.get_config_dir.return_value = str(config_dir)
-    config.get_dockerfile_path.return_value = dockerfile_path
-    config.read_extra_packages.return_value = []
-    config.generate_and_write_dockerfile.return_value = None
-
-    container_mgr = Mock(spec=ContainerManager)
+    mock_config.exists.return_value = True
+    mock_config.read_image_name.return_value = "cj-test-image"
+    mock_config.read_extra_packages.return_value = []
+    mock_config.generate_and_write_dockerfile.return_value = None
 
-    update_cmd = UpdateCommand(config, container_mgr)
+    update_cmd = UpdateCommand(mock_config, mock_container_manager)
 
     result = update_cmd.run()
 
     # Verify build_image called with correct params
     assert result == 0
     expected_log_file = str(config_dir / "update.log")
-    container_mgr.build_image.assert_called_once_with(
+    mock_container_manager.build_image.assert_called_once_with(
         dockerfile_path, "cj-test-image", str(tmp_path), expected_log_file
     )